@@ -13,19 +13,35 @@ This server uses stdio transport for secure local communication.
 
 import os
 import sys
+import re
 import json
+import codecs
+import copy
 import asyncio
-import fnmatch
 import hashlib
 import stat
+import time
+import select
+import shlex
+import itertools
+import tempfile
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Iterable
 from dotenv import load_dotenv
 from datetime import datetime
 
 import paramiko
 from fastmcp import FastMCP
 
+try:
+    import pathspec  # Optional: alternative ignore-pattern engine
+except ImportError:
+    pathspec = None
+
 # Load environment variables
 load_dotenv()
 
@@ -37,12 +53,57 @@ TARGET_PASSWORD = os.environ.get("TARGET_PASSWORD")
 LOCAL_PATH = os.environ.get("LOCAL_PATH")
 REMOTE_PATH = os.environ.get("REMOTE_PATH")
 
+# LOCAL_PATH made absolute with a trailing separator, for mapping local files onto REMOTE_PATH
+_LOCAL_PATH_PREFIX = os.path.normcase(os.path.join(os.path.abspath(LOCAL_PATH), '')) if LOCAL_PATH else None
+
+# Validate required connection settings once at startup
+_MISSING_CONFIG = [name for name, value in (("TARGET_HOST", TARGET_HOST),
+                                            ("TARGET_USERNAME", TARGET_USERNAME),
+                                            ("TARGET_PASSWORD", TARGET_PASSWORD)) if not value]
+_CONFIG_OK = not _MISSING_CONFIG
+
 # Parse ignore patterns
 ignore_patterns_str = os.environ.get("IGNORE_PATTERNS", "[]")
 try:
     IGNORE_PATTERNS = json.loads(ignore_patterns_str)
 except json.JSONDecodeError:
     IGNORE_PATTERNS = []
+# Anything but a list of strings (e.g. a bare "*.log", which would be read per character) is ignored
+if not isinstance(IGNORE_PATTERNS, list) or not all(isinstance(p, str) for p in IGNORE_PATTERNS):
+    IGNORE_PATTERNS = []
+
+# Ignore-pattern engine: "builtin" (GitIgnoreMatcher) or "pathspec" (needs the optional pathspec package)
+IGNORE_ENGINE = os.environ.get("IGNORE_ENGINE", "builtin").lower()
+
+# Persistent cache of local file hashes, keyed by absolute path
+HASH_CACHE_FILE = os.environ.get("HASH_CACHE_FILE") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "sftp-mcp-server", "hash_cache.json")
+
+# Number of parallel upload connections used by sync_directory
+SYNC_WORKERS = max(1, int(os.environ.get("SYNC_WORKERS", 8)))
+# Files queued ahead of the upload workers while the local walk continues
+UPLOAD_QUEUE_SIZE = 256
+
+# Connection pool settings shared by all tool calls
+# Large enough by default to keep every sync worker plus the walking connection warm between syncs
+SSH_POOL_SIZE = max(1, int(os.environ.get("SSH_POOL_SIZE", SYNC_WORKERS + 1)))
+SSH_IDLE_TIMEOUT = float(os.environ.get("SSH_IDLE_TIMEOUT", 300))
+SSH_KEEPALIVE_INTERVAL = 30
+# zlib compression pays off for text-heavy trees over slow links, but costs CPU on fast ones
+SFTP_COMPRESS = os.environ.get("SFTP_COMPRESS", "0").lower() in ("1", "true", "yes")
+
+# Flow-control sizes for channels (SFTP, exec) opened on each connection
+SSH_WINDOW_SIZE = 128 * 1024 * 1024
+SSH_MAX_PACKET_SIZE = 512 * 1024
+
+# Chunk sizes for streaming remote file reads and local upload reads
+READ_CHUNK_SIZE = 64 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+COMMAND_RECV_SIZE = 64 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+# Remote files hashed per md5sum invocation, keeping the command line well under ARG_MAX
+REMOTE_HASH_BATCH_SIZE = 200
 
 # Create FastMCP server instance
 mcp = FastMCP("SFTP-MCP-Server")
@@ -50,8 +111,8 @@ mcp = FastMCP("SFTP-MCP-Server")
 
 def get_ssh_client():
     """Create and return an SSH client connection."""
-    if not all([TARGET_HOST, TARGET_USERNAME, TARGET_PASSWORD]):
-        raise ValueError("Missing required SFTP connection parameters")
+    if not _CONFIG_OK:
+        raise ValueError(f"Missing required SFTP connection parameters: {', '.join(_MISSING_CONFIG)}")
     
     ssh = paramiko.SSHClient()
     ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -60,26 +121,189 @@ def get_ssh_client():
         port=TARGET_PORT,
         username=TARGET_USERNAME,
         password=TARGET_PASSWORD,
-        timeout=15
+        timeout=15,
+        compress=SFTP_COMPRESS
     )
+    transport = ssh.get_transport()
+    # A larger window keeps the pipe full on high-latency links instead of stalling on window adjusts
+    transport.default_window_size = SSH_WINDOW_SIZE
+    transport.default_max_packet_size = SSH_MAX_PACKET_SIZE
+    # Keep NAT/firewall state alive while the connection sits in the pool
+    transport.set_keepalive(SSH_KEEPALIVE_INTERVAL)
     return ssh
 
 
+# Idle (ssh_client, sftp, last_used) tuples; LIFO so the warmest connection is reused first
+_client_pool: "queue.LifoQueue[Tuple[paramiko.SSHClient, paramiko.SFTPClient, float]]" = \
+    queue.LifoQueue(maxsize=SSH_POOL_SIZE)
+_reaper_started = False
+_reaper_lock = threading.Lock()
+
+
+def _close_connection(ssh_client: paramiko.SSHClient, sftp: paramiko.SFTPClient) -> None:
+    """Close a pooled connection, ignoring errors from already-dead transports."""
+    for conn in (sftp, ssh_client):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def _is_connection_alive(ssh_client: paramiko.SSHClient, sftp: paramiko.SFTPClient) -> bool:
+    """Check that a pooled connection can still serve requests."""
+    transport = ssh_client.get_transport()
+    if transport is None or not transport.is_active():
+        return False
+    try:
+        sftp.stat('.')
+    except Exception:
+        return False
+    return True
+
+
+def _release_connection(ssh_client: paramiko.SSHClient, sftp: paramiko.SFTPClient) -> None:
+    """Return a connection to the pool, or close it if it is dead or the pool is full."""
+    transport = ssh_client.get_transport()
+    if transport is not None and transport.is_active():
+        try:
+            _client_pool.put_nowait((ssh_client, sftp, time.monotonic()))
+            _start_idle_reaper()
+            return
+        except queue.Full:
+            pass
+    _close_connection(ssh_client, sftp)
+
+
+def _reap_idle_connections() -> None:
+    """Close pooled connections idle longer than SSH_IDLE_TIMEOUT, so an idle server holds none open."""
+    interval = max(1.0, min(SSH_IDLE_TIMEOUT / 2, 60.0))
+    while True:
+        time.sleep(interval)
+        now = time.monotonic()
+        # Filter under the queue's own mutex so concurrent borrows never see a half-drained pool
+        with _client_pool.mutex:
+            stale = [entry for entry in _client_pool.queue if now - entry[2] > SSH_IDLE_TIMEOUT]
+            if stale:
+                _client_pool.queue[:] = [entry for entry in _client_pool.queue
+                                         if now - entry[2] <= SSH_IDLE_TIMEOUT]
+                _client_pool.not_full.notify(len(stale))
+        for ssh_client, sftp, _ in stale:
+            _close_connection(ssh_client, sftp)
+
+
+def _start_idle_reaper() -> None:
+    """Start the idle-connection reaper thread once, on first use of the pool."""
+    global _reaper_started
+    if _reaper_started:
+        return
+    with _reaper_lock:
+        if not _reaper_started:
+            threading.Thread(target=_reap_idle_connections, name="sftp-pool-reaper", daemon=True).start()
+            _reaper_started = True
+
+
+def _acquire_connection() -> Tuple[paramiko.SSHClient, paramiko.SFTPClient]:
+    """Take an idle pooled (ssh_client, sftp) pair, connecting only when no idle one is usable."""
+    while True:
+        try:
+            ssh_client, sftp, last_used = _client_pool.get_nowait()
+        except queue.Empty:
+            break
+        idle = time.monotonic() - last_used
+        if idle > SSH_IDLE_TIMEOUT:
+            _close_connection(ssh_client, sftp)
+            continue
+        # Recently used connections only need the cheap transport check, not a round-trip
+        if idle > SSH_KEEPALIVE_INTERVAL:
+            alive = _is_connection_alive(ssh_client, sftp)
+        else:
+            transport = ssh_client.get_transport()
+            alive = transport is not None and transport.is_active()
+        if not alive:
+            _close_connection(ssh_client, sftp)
+            continue
+        return ssh_client, sftp
+    
+    ssh_client = get_ssh_client()
+    try:
+        return ssh_client, ssh_client.open_sftp()
+    except Exception:
+        ssh_client.close()
+        raise
+
+
+@contextmanager
+def borrow_ssh():
+    """Borrow a pooled (ssh_client, sftp) pair for the duration of a with block."""
+    connection = _acquire_connection()
+    try:
+        yield connection
+    finally:
+        _release_connection(*connection)
+
+
 class GitIgnoreMatcher:
     """Enhanced ignore pattern matcher supporting .gitignore format."""
     
     def __init__(self, patterns: List[str]):
-        self.patterns = []
+        # (compiled_regex, negation, dir_only) tuples, in pattern order
+        self.rules = self._parse_patterns(patterns)
+        self._build_matchers()
+    
+    def extend(self, patterns: List[str]) -> "GitIgnoreMatcher":
+        """
+        Return a matcher with patterns appended after this matcher's rules.
+        
+        Existing rules are reused rather than parsed again, and this matcher is left unchanged.
+        """
+        new_rules = self._parse_patterns(patterns)
+        if not new_rules:
+            return self
+        
+        matcher = copy.copy(self)
+        matcher.rules = self.rules + new_rules
+        matcher._build_matchers()
+        return matcher
+    
+    def _parse_patterns(self, patterns: List[str]) -> List[Tuple["re.Pattern[str]", bool, bool]]:
+        """Parse pattern lines into rules, skipping blanks and comments."""
+        rules = []
         for pattern in patterns:
             pattern = pattern.strip()
             if not pattern or pattern.startswith('#'):
                 continue
-            self.patterns.append(self._parse_pattern(pattern))
+            try:
+                rules.append(self._parse_pattern(pattern))
+            except re.error:
+                continue  # Like git, skip patterns that cannot be matched (e.g. [z-a])
+        return rules
     
-    def _parse_pattern(self, pattern: str) -> Dict[str, Any]:
-        """Parse a gitignore pattern into components."""
-        original_pattern = pattern
+    def _build_matchers(self) -> None:
+        """Combine self.rules into the matchers used by match()."""
+        # One combined matcher for directories and one for files (without directory-only rules)
+        self._dir_matcher = self._combine([(regex, negation) for regex, negation, _ in self.rules])
+        self._file_matcher = self._combine([(regex, negation) for regex, negation, dir_only in self.rules
+                                            if not dir_only])
+    
+    @staticmethod
+    def _combine(rules: List[Tuple["re.Pattern[str]", bool]]):
+        """
+        Join rules into a single alternation regex, newest rule first.
+        
+        Each rule becomes one capturing group, so the first alternative that matches
+        is the last matching rule and its lastindex identifies the rule's negation.
         
+        Returns:
+            (bound match method or None, negation flags indexed by group number - 1)
+        """
+        if not rules:
+            return None, []
+        rules = rules[::-1]
+        combined = re.compile('|'.join(f'({regex.pattern})' for regex, _ in rules))
+        return combined.match, [negation for _, negation in rules]
+    
+    def _parse_pattern(self, pattern: str) -> Tuple["re.Pattern[str]", bool, bool]:
+        """Parse a gitignore pattern into a compiled rule."""
         # Check for negation
         negation = pattern.startswith('!')
         if negation:
@@ -90,67 +314,131 @@ class GitIgnoreMatcher:
         if dir_only:
             pattern = pattern[:-1]
         
-        # Handle leading slash
-        anchored = pattern.startswith('/')
-        if anchored:
+        # A slash at the start or in the middle anchors the pattern to the root, as in git
+        anchored = '/' in pattern
+        if pattern.startswith('/'):
             pattern = pattern[1:]
         
-        # Handle trailing **
-        if pattern.endswith('**'):
-            pattern = pattern[:-2] + '*'
-        
-        return {
-            'pattern': pattern,
-            'negation': negation,
-            'dir_only': dir_only,
-            'anchored': anchored,
-            'original': original_pattern
-        }
+        # Anchored patterns match from the root, others at any directory level
+        prefix = '^' if anchored else '(?:^|.*/)'
+        regex = re.compile(prefix + self._glob_to_regex(pattern) + r'\Z')
+        return regex, negation, dir_only
     
-    def match(self, path: str, is_dir: bool = False) -> bool:
-        """Check if path matches any ignore pattern."""
-        path = path.replace('\\', '/')
+    @staticmethod
+    def _glob_to_regex(pattern: str) -> str:
+        """
+        Translate a glob into a regex following gitignore's ** rules.
         
-        # Track if any negation matches
-        negated = False
+        A leading "**/" matches in all directories, a trailing "/**" matches everything
+        inside, and "/**/" matches zero or more directories. Any other * (including a
+        ** elsewhere) stays within one path component.
+        """
+        if pattern == '**':
+            return '.*'
         
-        for rule in self.patterns:
-            # Skip directory-only patterns for files
-            if rule['dir_only'] and not is_dir:
+        parts = []
+        i, n = 0, len(pattern)
+        while i < n:
+            if i == 0 and pattern.startswith('**/'):
+                parts.append('(?:.*/)?')
+                i = 3
+                continue
+            if pattern.startswith('/**/', i):
+                parts.append('/(?:.*/)?')
+                i += 4
                 continue
+            if i == n - 3 and pattern.endswith('/**'):
+                parts.append('/.*')
+                break
             
-            match_path = path
-            if rule['anchored']:
-                # Anchored patterns match from root
-                if not path.startswith(rule['pattern']):
+            c = pattern[i]
+            i += 1
+            if c == '*':
+                while i < n and pattern[i] == '*':
+                    i += 1
+                parts.append('[^/]*')
+            elif c == '?':
+                parts.append('[^/]')
+            elif c == '[':
+                # Character class: find the closing bracket, allowing a leading ! or ]
+                j = i
+                if j < n and pattern[j] == '!':
+                    j += 1
+                if j < n and pattern[j] == ']':
+                    j += 1
+                j = pattern.find(']', j)
+                if j < 0:
+                    parts.append(re.escape(c))
                     continue
-            
-            # Check for exact match or wildcard match
-            matched = False
-            if rule['pattern'] == '':
-                matched = True
-            elif '**' in rule['pattern']:
-                # Handle ** wildcards
-                parts = rule['pattern'].split('**')
-                if all(part in match_path for part in parts if part):
-                    matched = True
-            elif fnmatch.fnmatch(match_path, rule['pattern']) or \
-                 fnmatch.fnmatch(os.path.basename(match_path), rule['pattern']):
-                matched = True
-            
-            if matched:
-                if rule['negation']:
-                    negated = True
-                else:
-                    if not negated:
-                        return True
+                chars = pattern[i:j].replace('\\', '\\\\')
+                # Escape characters Python would read as nested sets or set operations
+                chars = ''.join('\\' + ch if ch in '[&~|' else ch for ch in chars)
+                if chars.startswith('!'):
+                    chars = '^' + chars[1:]
+                elif chars.startswith('^'):
+                    chars = '\\' + chars
+                parts.append('[' + chars + ']')
+                i = j + 1
+            else:
+                parts.append(re.escape(c))
+        return ''.join(parts)
+    
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Check if path matches any ignore pattern; the last matching rule wins."""
+        path = path.replace('\\', '/')
+        
+        combined_match, negations = self._dir_matcher if is_dir else self._file_matcher
+        if combined_match is None:
+            return False
+        
+        m = combined_match(path)
+        if m is None:
+            return False
+        return not negations[m.lastindex - 1]
+
+class PathSpecMatcher:
+    """Ignore pattern matcher backed by pathspec's GitIgnoreSpec, with the GitIgnoreMatcher interface."""
+    
+    def __init__(self, patterns: List[str], spec=None):
+        self.spec = spec if spec is not None else self._build_spec(patterns)
+    
+    @staticmethod
+    def _build_spec(patterns: List[str]):
+        """Build a GitIgnoreSpec, skipping patterns pathspec cannot compile."""
+        try:
+            return pathspec.GitIgnoreSpec.from_lines(patterns)
+        except (re.error, ValueError):
+            pass
         
-        return negated
+        valid = []
+        for pattern in patterns:
+            try:
+                pathspec.GitIgnoreSpec.from_lines([pattern])
+            except (re.error, ValueError):
+                continue
+            valid.append(pattern)
+        return pathspec.GitIgnoreSpec.from_lines(valid)
+    
+    def extend(self, patterns: List[str]) -> "PathSpecMatcher":
+        """Return a matcher with patterns appended after this matcher's rules."""
+        if not patterns:
+            return self
+        return PathSpecMatcher([], self.spec + self._build_spec(patterns))
+    
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Check if path matches any ignore pattern; the last matching rule wins."""
+        path = path.replace('\\', '/')
+        # pathspec recognises directories by their trailing slash
+        return self.spec.match_file(path + '/' if is_dir else path)
+
+def create_ignore_matcher(patterns: List[str]):
+    """Create an ignore matcher using the engine selected by IGNORE_ENGINE."""
+    if IGNORE_ENGINE == "pathspec" and pathspec is not None:
+        return PathSpecMatcher(patterns)
+    return GitIgnoreMatcher(patterns)
 
-def is_ignored(path: str, ignore_patterns: List[str], is_dir: bool = False) -> bool:
-    """Check if a path should be ignored based on patterns."""
-    matcher = GitIgnoreMatcher(ignore_patterns)
-    return matcher.match(path, is_dir)
+# Environment patterns never change, so they are parsed once and only extended per sync
+_ENV_IGNORE_MATCHER = create_ignore_matcher(IGNORE_PATTERNS)
 
 def load_gitignore_patterns(local_path: str) -> List[str]:
     """Load .gitignore patterns from local directory."""
@@ -167,35 +455,120 @@ def load_gitignore_patterns(local_path: str) -> List[str]:
     return patterns
 
 
-def get_file_hash(file_path: str) -> str:
-    """Calculate MD5 hash of a file."""
-    hash_md5 = hashlib.md5()
+def scan_local_tree(local_dir: str, rel_prefix: str = ''):
+    """
+    Walk a local directory top-down using os.scandir.
+    
+    Yields (rel_prefix, dir_entries, file_entries) for every directory, where
+    rel_prefix is the '/'-separated path relative to the walk root ('' or ending
+    in '/') and the entries are os.DirEntry objects with cached type/stat data.
+    As with os.walk(topdown=True), callers may prune dir_entries in place to skip
+    subtrees. Symlinked directories are reported but not descended into.
+    """
+    dir_entries = []
+    file_entries = []
+    try:
+        with os.scandir(local_dir) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                (dir_entries if is_dir else file_entries).append(entry)
+    except OSError:
+        return  # Unreadable directory, skipped like os.walk does
+    
+    yield rel_prefix, dir_entries, file_entries
+    
+    for entry in dir_entries:
+        if not entry.is_symlink():
+            yield from scan_local_tree(entry.path, rel_prefix + entry.name + '/')
+
+
+def get_file_hash(file_path: str, algorithm: str = "md5") -> str:
+    """
+    Calculate the hash of a file.
+    
+    Args:
+        file_path: Path of the local file
+        algorithm: Any hashlib algorithm name
+    
+    Returns:
+        Hex digest, or an empty string if the file could not be read
+    """
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            
+            digest = hashlib.new(algorithm)
+            buf = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                digest.update(view[:n])
+            return digest.hexdigest()
     except Exception:
         return ""
 
-def get_remote_file_info(sftp, remote_path: str) -> Optional[Dict[str, Any]]:
-    """Get remote file information including size and modification time."""
+def load_hash_cache() -> Dict[str, List[Any]]:
+    """Load the persistent hash cache ({abs_path: [size, mtime, md5]})."""
     try:
-        stat = sftp.stat(remote_path)
-        return {
-            'size': stat.st_size,
-            'mtime': stat.st_mtime
-        }
-    except FileNotFoundError:
-        return None
+        with open(HASH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_hash_cache(hash_cache: Dict[str, List[Any]]) -> None:
+    """Atomically write the persistent hash cache."""
+    tmp_path = None
+    try:
+        cache_dir = os.path.dirname(HASH_CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        # A unique temp file per call, since concurrent syncs in one process may save at the same time
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(hash_cache, f)
+        os.replace(tmp_path, HASH_CACHE_FILE)
+    except OSError:
+        # The cache is only an optimization
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+def get_cached_file_hash(local_path: str, local_stat: os.stat_result,
+                         hash_cache: Dict[str, List[Any]]) -> str:
+    """
+    Return a file's MD5, reusing the cached value while its size and mtime are unchanged.
+    
+    local_path is used as the cache key as-is, so callers should pass absolute paths.
+    """
+    cached = hash_cache.get(local_path)
+    if cached and cached[0] == local_stat.st_size and cached[1] == local_stat.st_mtime:
+        return cached[2]
+    
+    file_hash = get_file_hash(local_path)
+    if file_hash:
+        hash_cache[local_path] = [local_stat.st_size, local_stat.st_mtime, file_hash]
+    return file_hash
 
 def should_sync_file(local_path: str, remote_info: Optional[Dict[str, Any]], 
-                    check_hash: bool = False) -> bool:
-    """Determine if a file should be synced based on various criteria."""
+                    check_hash: bool = False, local_stat: Optional[os.stat_result] = None,
+                    hash_cache: Optional[Dict[str, List[Any]]] = None) -> bool:
+    """
+    Determine if a file should be synced based on various criteria.
+    
+    local_stat may be passed in (e.g. from os.DirEntry.stat()) to avoid stat-ing the file again,
+    and hash_cache lets unchanged files reuse a previously computed hash. With check_hash,
+    remote_info must carry the remote file's MD5 under 'hash' (see get_remote_file_hashes).
+    """
     if remote_info is None:
         return True
     
-    local_stat = os.stat(local_path)
+    if local_stat is None:
+        local_stat = os.stat(local_path)
     
     # Check file size first (fast check)
     if local_stat.st_size != remote_info['size']:
@@ -211,26 +584,350 @@ def should_sync_file(local_path: str, remote_info: Optional[Dict[str, Any]],
     
     # Optionally check hash (slow but accurate)
     if check_hash:
-        local_hash = get_file_hash(local_path)
-        return local_hash != get_remote_file_hash(local_path, remote_info)
+        if hash_cache is not None:
+            local_hash = get_cached_file_hash(local_path, local_stat, hash_cache)
+        else:
+            local_hash = get_file_hash(local_path)
+        return not local_hash or local_hash != remote_info.get('hash')
     
     return False
 
-@mcp.tool()
-def sync_directory(local_dir: Optional[str] = None, remote_dir: Optional[str] = None, 
-                  skip_unchanged: bool = True, check_hash: bool = False) -> Dict[str, Any]:
+def run_remote_command(ssh_client: paramiko.SSHClient, command: str) -> Tuple[int, bytes, bytes]:
     """
-    Synchronize a local directory to remote SFTP server.
+    Run a command on the remote host and collect its output.
+    
+    Returns:
+        (exit_code, stdout, stderr)
+    """
+    channel = ssh_client.get_transport().open_session()
+    try:
+        # No pty is requested, so stdout and stderr stay separate streams
+        channel.exec_command(command)
+        
+        # Drain stdout and stderr together so neither pipe can fill and block the command
+        stdout_data = bytearray()
+        stderr_data = bytearray()
+        while not channel.exit_status_ready() or channel.recv_ready() or channel.recv_stderr_ready():
+            select.select([channel], [], [], 1.0)
+            # Empty both buffers on every wakeup rather than taking one chunk per select call
+            while channel.recv_ready():
+                stdout_data += channel.recv(COMMAND_RECV_SIZE)
+            while channel.recv_stderr_ready():
+                stderr_data += channel.recv_stderr(COMMAND_RECV_SIZE)
+        
+        # Collect anything still in flight until EOF
+        while chunk := channel.recv(COMMAND_RECV_SIZE):
+            stdout_data += chunk
+        while chunk := channel.recv_stderr(COMMAND_RECV_SIZE):
+            stderr_data += chunk
+        
+        return channel.recv_exit_status(), bytes(stdout_data), bytes(stderr_data)
+    finally:
+        channel.close()
+
+def get_remote_file_hashes(ssh_client: paramiko.SSHClient, remote_paths: List[str]) -> Dict[str, str]:
+    """
+    Hash remote files server-side with md5sum, batching many paths into one command.
     
     Args:
-        local_dir: Local directory path (defaults to LOCAL_PATH env var)
-        remote_dir: Remote directory path (defaults to REMOTE_PATH env var)
-        skip_unchanged: Skip files that haven't changed (default: True)
-        check_hash: Use file hash for change detection (default: False)
+        ssh_client: Connected SSH client
+        remote_paths: Remote file paths to hash
     
     Returns:
-        Dictionary with sync results including uploaded files and any errors
+        {remote_path: md5 hex digest}; paths that could not be hashed are absent
+    """
+    hashes = {}
+    for i in range(0, len(remote_paths), REMOTE_HASH_BATCH_SIZE):
+        batch = remote_paths[i:i + REMOTE_HASH_BATCH_SIZE]
+        command = "md5sum -- " + " ".join(shlex.quote(path) for path in batch)
+        try:
+            _, stdout, _ = run_remote_command(ssh_client, command)
+        except Exception:
+            continue
+        
+        # Each line is "<digest>  <path>"; md5sum escapes unusual names with a leading backslash
+        for line in stdout.decode('utf-8', errors='surrogateescape').splitlines():
+            if line.startswith('\\'):
+                continue
+            digest, _, path = line.partition(' ')
+            hashes[path[1:]] = digest
+    return hashes
+
+# Remote directory -> {entry name: attributes}, or None when the directory cannot be listed
+RemoteDirCache = Dict[str, Optional[Dict[str, Optional[paramiko.SFTPAttributes]]]]
+
+def list_remote_dir(sftp, remote_dir: str,
+                    dir_cache: RemoteDirCache) -> Optional[Dict[str, Optional[paramiko.SFTPAttributes]]]:
     """
+    List a remote directory at most once per sync.
+    
+    A single listdir_attr round-trip returns the attributes of every entry, which
+    replaces one stat per file when checking for changes.
+    
+    Returns:
+        Mapping of entry name to its attributes, or None if the directory cannot be listed
+    """
+    if remote_dir not in dir_cache:
+        try:
+            dir_cache[remote_dir] = {attr.filename: attr for attr in sftp.listdir_attr(remote_dir)}
+        except IOError:
+            dir_cache[remote_dir] = None
+    return dir_cache[remote_dir]
+
+def ensure_remote_dir(sftp, remote_dir: str, dir_cache: RemoteDirCache) -> List[str]:
+    """
+    Create a remote directory and any missing parents.
+    
+    Existence is derived from cached parent listings (see list_remote_dir), so
+    each parent costs at most one round-trip instead of a stat per path component.
+    
+    Returns:
+        List of remote directories that were created
+    """
+    parts = [part for part in remote_dir.split('/') if part]
+    paths = ['/' + '/'.join(parts[:i + 1]) for i in range(len(parts))]
+    
+    # Resume below the deepest ancestor already known to exist
+    start = 0
+    for i in range(len(paths) - 1, -1, -1):
+        if dir_cache.get(paths[i]) is not None:
+            start = i + 1
+            break
+    
+    created = []
+    parent = paths[start - 1] if start else "/"
+    for part, current_path in zip(parts[start:], paths[start:]):
+        names = list_remote_dir(sftp, parent, dir_cache)
+        if names is None:
+            # Parent is not listable (e.g. execute-only): try mkdir, which fails if it already exists
+            try:
+                sftp.mkdir(current_path)
+                created.append(current_path)
+                dir_cache[current_path] = {}
+            except IOError:
+                pass
+        elif part not in names:
+            sftp.mkdir(current_path)
+            created.append(current_path)
+            names[part] = None
+            # A freshly created directory is known to be empty
+            dir_cache[current_path] = {}
+        parent = current_path
+    return created
+
+def make_remote_dirs(sftp, remote_dir: str) -> List[str]:
+    """
+    Create a remote directory and any missing parents without listing them.
+    
+    Suited to one-off uploads: an existing directory costs a single stat, and each
+    missing level a single mkdir (which simply fails for levels that already exist).
+    
+    Returns:
+        List of remote directories that were created
+    """
+    try:
+        sftp.stat(remote_dir)
+        return []
+    except FileNotFoundError:
+        pass
+    
+    created = []
+    current_path = ''
+    for part in remote_dir.split('/'):
+        if not part:
+            continue
+        current_path += '/' + part
+        try:
+            sftp.mkdir(current_path)
+            created.append(current_path)
+        except IOError:
+            pass
+    return created
+
+def put_file(sftp, local_file_path: str, remote_file_path: str, confirm: bool = True,
+             preserve_times: bool = True,
+             hash_cache: Optional[Dict[str, List[Any]]] = None) -> Optional[paramiko.SFTPAttributes]:
+    """
+    Upload a local file using pipelined SFTP writes.
+    
+    Write requests are sent without waiting for each ACK (bounded by the channel
+    window), so throughput is not capped at one 32 KiB request per round-trip.
+    
+    Args:
+        sftp: Open SFTP client
+        local_file_path: Path of the local file to upload
+        remote_file_path: Remote destination path
+        confirm: Stat the remote file afterwards and verify its size
+        preserve_times: Copy the local access/modification times to the remote file
+        hash_cache: If given, the MD5 of the uploaded bytes is recorded for local_file_path
+    
+    Returns:
+        Remote file attributes when confirm is True, otherwise None
+    """
+    with open(local_file_path, 'rb') as local_file:
+        local_stat = os.fstat(local_file.fileno())
+        file_size = local_stat.st_size
+        digest = hashlib.md5() if hash_cache is not None else None
+        with sftp.open(remote_file_path, 'wb') as remote_file:
+            remote_file.set_pipelined(True)
+            while buf := local_file.read(UPLOAD_CHUNK_SIZE):
+                remote_file.write(buf)
+                if digest is not None:
+                    digest.update(buf)
+    
+    # Hashing while uploading spares the next check_hash sync from reading the file again
+    if digest is not None:
+        hash_cache[local_file_path] = [file_size, local_stat.st_mtime, digest.hexdigest()]
+    
+    # Matching mtimes let later syncs skip the file without re-uploading it
+    if preserve_times:
+        try:
+            sftp.utime(remote_file_path, (local_stat.st_atime, local_stat.st_mtime))
+        except IOError:
+            pass  # Best-effort: the bytes are written, at worst the next sync re-uploads the file
+    
+    if not confirm:
+        return None
+    remote_stat = sftp.stat(remote_file_path)
+    if remote_stat.st_size != file_size:
+        raise IOError(f"size mismatch in put! {remote_stat.st_size} != {file_size}")
+    return remote_stat
+
+def upload_files_sequential(sftp, upload_tasks: Iterable[Tuple[str, str, str]],
+                            results: Dict[str, Any],
+                            hash_cache: Optional[Dict[str, List[Any]]] = None) -> None:
+    """Upload files one after another over an existing SFTP connection."""
+    for local_file_path, remote_file_path, relative_file_path in upload_tasks:
+        try:
+            put_file(sftp, local_file_path, remote_file_path, confirm=False, hash_cache=hash_cache)
+            results["uploaded_files"].append(relative_file_path)
+        except Exception as e:
+            results["errors"].append(f"Failed to upload {relative_file_path}: {str(e)}")
+
+def upload_files_parallel(upload_tasks: Iterable[Tuple[str, str, str]], results: Dict[str, Any],
+                          max_workers: int = SYNC_WORKERS,
+                          hash_cache: Optional[Dict[str, List[Any]]] = None,
+                          fallback_sftp=None) -> None:
+    """
+    Upload files concurrently, each worker thread using its own pooled SSH/SFTP connection.
+    
+    Tasks are handed to the workers through a bounded queue as upload_tasks yields them,
+    so a generator that is still walking the local tree overlaps with the uploads.
+    
+    A worker that cannot open a connection (e.g. the server limits connections per user)
+    hands its task back and stops, leaving the queue to the connected workers. Whatever
+    no worker could take is uploaded sequentially over fallback_sftp (or a borrowed
+    connection when none is given).
+    """
+    task_queue: "queue.Queue[Optional[Tuple[str, str, str]]]" = queue.Queue(maxsize=UPLOAD_QUEUE_SIZE)
+    # Tasks handed back by workers that could not connect; unbounded so handing back never blocks
+    returned_tasks: "queue.SimpleQueue[Tuple[str, str, str]]" = queue.SimpleQueue()
+    connections = []
+    lock = threading.Lock()
+    live_workers = max_workers
+    
+    def next_task() -> Optional[Tuple[str, str, str]]:
+        try:
+            return returned_tasks.get_nowait()
+        except queue.Empty:
+            return task_queue.get()
+    
+    def upload(sftp, task: Tuple[str, str, str]) -> None:
+        local_file_path, remote_file_path, relative_file_path = task
+        try:
+            put_file(sftp, local_file_path, remote_file_path, confirm=False, hash_cache=hash_cache)
+            with lock:
+                results["uploaded_files"].append(relative_file_path)
+                
+        except Exception as e:
+            with lock:
+                results["errors"].append(f"Failed to upload {relative_file_path}: {str(e)}")
+    
+    def worker() -> None:
+        nonlocal live_workers
+        try:
+            # paramiko SFTP channels are not thread-safe, so every worker owns one, opened on its first task
+            sftp = None
+            while (task := next_task()) is not None:
+                if sftp is None:
+                    try:
+                        connection = _acquire_connection()
+                    except Exception:
+                        returned_tasks.put(task)
+                        return
+                    with lock:
+                        connections.append(connection)
+                    sftp = connection[1]
+                upload(sftp, task)
+            
+            # Pick up tasks handed back by workers that could not connect
+            while sftp is not None:
+                try:
+                    task = returned_tasks.get_nowait()
+                except queue.Empty:
+                    break
+                upload(sftp, task)
+        finally:
+            with lock:
+                live_workers -= 1
+    
+    def hand_off(item: Optional[Tuple[str, str, str]]) -> bool:
+        """Queue an item for the workers; False once no worker is left to take it."""
+        while True:
+            try:
+                task_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                with lock:
+                    if live_workers == 0:
+                        return False
+    
+    leftover = []
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            workers = [executor.submit(worker) for _ in range(max_workers)]
+            try:
+                for task in upload_tasks:
+                    if not hand_off(task):
+                        leftover.append(task)
+                        break
+            finally:
+                # One sentinel per worker, queued after all real tasks
+                for _ in workers:
+                    if not hand_off(None):
+                        break
+        
+        # Every worker has stopped; collect what none of them could take
+        while True:
+            try:
+                task = task_queue.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                leftover.append(task)
+        while True:
+            try:
+                leftover.append(returned_tasks.get_nowait())
+            except queue.Empty:
+                break
+        
+        # upload_tasks may still be partway through when all workers failed to connect
+        remaining = itertools.chain(leftover, upload_tasks)
+        if fallback_sftp is not None:
+            upload_files_sequential(fallback_sftp, remaining, results, hash_cache)
+        else:
+            remaining = list(remaining)
+            if remaining:
+                with borrow_ssh() as (_, sftp):
+                    upload_files_sequential(sftp, remaining, results, hash_cache)
+    finally:
+        for connection in connections:
+            _release_connection(*connection)
+
+def _sync_directory(local_dir: Optional[str] = None, remote_dir: Optional[str] = None, 
+                    skip_unchanged: bool = True, check_hash: bool = False,
+                    concurrency: int = SYNC_WORKERS) -> Dict[str, Any]:
+    """Blocking implementation of the sync_directory tool."""
     # Validate parameters against environment variables
     if local_dir is not None and LOCAL_PATH and local_dir != LOCAL_PATH:
         return {"error": f"Parameter local_dir '{local_dir}' does not match LOCAL_PATH env var '{LOCAL_PATH}'. Please use consistent configuration."}
@@ -247,85 +944,120 @@ def sync_directory(local_dir: Optional[str] = None, remote_dir: Optional[str] =
     if not os.path.exists(local_path):
         return {"error": f"Local path does not exist: {local_path}"}
     
+    # Client-supplied concurrency is capped so one call cannot open a connection per file
+    concurrency = max(1, min(concurrency, SYNC_WORKERS))
+    
     # Log the actual paths being used for transparency
     print(f"[SFTP-MCP] Syncing from '{local_path}' to '{remote_path}'")
     
-    # Load gitignore patterns if available
-    gitignore_patterns = load_gitignore_patterns(local_path)
-    all_patterns = IGNORE_PATTERNS + gitignore_patterns
+    # Previously computed hashes let unchanged files skip re-hashing
+    hash_cache = load_hash_cache() if check_hash else None
     
     try:
-        ssh_client = get_ssh_client()
-        sftp = ssh_client.open_sftp()
+        # Load gitignore patterns if available and compile all rules once for the whole walk
+        gitignore_patterns = load_gitignore_patterns(local_path)
+        ignore_matcher = _ENV_IGNORE_MATCHER.extend(gitignore_patterns)
         
-        results = {
-            "uploaded_files": [],
-            "skipped_files": [],
-            "created_directories": [],
-            "ignored_items": [],
-            "errors": []
-        }
-        
-        # Ensure remote base directory exists
-        current_path = ""
-        for part in remote_path.split('/'):
-            if not part:
-                continue
-            current_path += '/' + part
-            try:
-                sftp.stat(current_path)
-            except FileNotFoundError:
-                sftp.mkdir(current_path)
-                results["created_directories"].append(current_path)
-        
-        # Walk through local directory
-        for root, dirs, files in os.walk(local_path, topdown=True):
-            # Filter ignored directories
-            original_dirs = list(dirs)
-            dirs[:] = [d for d in original_dirs 
-                      if not is_ignored(os.path.join(os.path.relpath(root, local_path), d), all_patterns, True)]
+        with borrow_ssh() as (ssh_client, sftp):
+            results = {
+                "uploaded_files": [],
+                "skipped_files": [],
+                "created_directories": [],
+                "ignored_items": [],
+                "errors": []
+            }
             
-            for d in original_dirs:
-                if d not in dirs:
-                    results["ignored_items"].append(os.path.join(os.path.relpath(root, local_path), d) + '/')
+            # Ensure remote base directory exists
+            dir_cache: RemoteDirCache = {}
+            results["created_directories"].extend(ensure_remote_dir(sftp, remote_path, dir_cache))
             
-            # Create remote directories
-            for dirname in dirs:
-                relative_dir_path = os.path.relpath(os.path.join(root, dirname), local_path)
-                remote_dir_path = os.path.join(remote_path, relative_dir_path).replace('\\', '/')
-                try:
-                    sftp.stat(remote_dir_path)
-                except FileNotFoundError:
-                    sftp.mkdir(remote_dir_path)
-                    results["created_directories"].append(remote_dir_path)
+            # Walk the local tree, yielding files to upload as they are found so uploads
+            # can start while the walk continues
+            remote_base = remote_path.rstrip('/')
+            # Walking from an absolute root makes every entry.path absolute without per-file abspath calls
+            local_root = os.path.abspath(local_path)
+            # Files present in this walk, used to prune stale hash cache entries afterwards
+            seen_files = set()
             
-            # Upload files
-            for filename in files:
-                relative_file_path = os.path.relpath(os.path.join(root, filename), local_path)
-                if is_ignored(relative_file_path, all_patterns):
-                    results["ignored_items"].append(relative_file_path)
-                    continue
-                
-                local_file_path = os.path.join(root, filename)
-                remote_file_path = os.path.join(remote_path, relative_file_path).replace('\\', '/')
-                
-                try:
-                    # Check if file should be synced
-                    remote_info = None
+            def collect_upload_tasks():
+                for rel_prefix, dir_entries, file_entries in scan_local_tree(local_root):
+                    remote_root = remote_base + '/' + rel_prefix
+                    
+                    # One listing per remote directory provides size/mtime for all its files
+                    remote_files = None
                     if skip_unchanged:
-                        remote_info = get_remote_file_info(sftp, remote_file_path)
+                        remote_files = list_remote_dir(sftp, remote_root[:-1] or '/', dir_cache)
                     
-                    if not skip_unchanged or should_sync_file(local_file_path, remote_info, check_hash):
-                        sftp.put(local_file_path, remote_file_path)
-                        results["uploaded_files"].append(relative_file_path)
-                    else:
-                        results["skipped_files"].append(relative_file_path)
+                    # Filter ignored directories in a single pass
+                    kept_dirs = []
+                    for entry in dir_entries:
+                        relative_dir_path = rel_prefix + entry.name
+                        if ignore_matcher.match(relative_dir_path, True):
+                            results["ignored_items"].append(relative_dir_path + '/')
+                        else:
+                            kept_dirs.append(entry)
+                    dir_entries[:] = kept_dirs
+                    
+                    # Create remote directories
+                    for entry in dir_entries:
+                        results["created_directories"].extend(
+                            ensure_remote_dir(sftp, remote_root + entry.name, dir_cache))
+                    
+                    # Collect files to upload
+                    hash_candidates = []
+                    for entry in file_entries:
+                        relative_file_path = rel_prefix + entry.name
+                        if ignore_matcher.match(relative_file_path):
+                            results["ignored_items"].append(relative_file_path)
+                            continue
+                        seen_files.add(entry.path)
                         
-                except Exception as e:
-                    results["errors"].append(f"Failed to upload {relative_file_path}: {str(e)}")
+                        try:
+                            # Check if file should be synced
+                            if skip_unchanged:
+                                attrs = remote_files.get(entry.name) if remote_files else None
+                                remote_info = {'size': attrs.st_size, 'mtime': attrs.st_mtime} if attrs else None
+                                if not should_sync_file(entry.path, remote_info, False, entry.stat()):
+                                    if check_hash:
+                                        # Size and mtime match; compare contents once the directory's hashes are in
+                                        hash_candidates.append((entry, relative_file_path, remote_info))
+                                    else:
+                                        results["skipped_files"].append(relative_file_path)
+                                    continue
+                        except Exception as e:
+                            results["errors"].append(f"Failed to upload {relative_file_path}: {str(e)}")
+                            continue
+                        
+                        yield (entry.path, remote_root + entry.name, relative_file_path)
+                    
+                    # One md5sum round-trip covers every candidate in this directory
+                    if hash_candidates:
+                        remote_hashes = get_remote_file_hashes(
+                            ssh_client, [remote_root + entry.name for entry, _, _ in hash_candidates])
+                        for entry, relative_file_path, remote_info in hash_candidates:
+                            remote_file_path = remote_root + entry.name
+                            remote_info['hash'] = remote_hashes.get(remote_file_path, "")
+                            try:
+                                if not should_sync_file(entry.path, remote_info, True, entry.stat(), hash_cache):
+                                    results["skipped_files"].append(relative_file_path)
+                                    continue
+                            except Exception as e:
+                                results["errors"].append(f"Failed to upload {relative_file_path}: {str(e)}")
+                                continue
+                            yield (entry.path, remote_file_path, relative_file_path)
+            
+            # A directory is created before any of its files are yielded, so workers never race on mkdir
+            if concurrency <= 1:
+                upload_files_sequential(sftp, collect_upload_tasks(), results, hash_cache)
+            else:
+                upload_files_parallel(collect_upload_tasks(), results, concurrency, hash_cache, sftp)
         
-        sftp.close()
-        ssh_client.close()
+        if hash_cache is not None:
+            # Drop entries for files under this tree that no longer exist or are now ignored
+            root_prefix = os.path.join(local_root, '')
+            for key in [key for key in hash_cache if key.startswith(root_prefix) and key not in seen_files]:
+                del hash_cache[key]
+            save_hash_cache(hash_cache)
         
         return results
         
@@ -334,66 +1066,64 @@ def sync_directory(local_dir: Optional[str] = None, remote_dir: Optional[str] =
 
 
 @mcp.tool()
-def upload_file(local_file_path: str, remote_file_path: Optional[str] = None) -> Dict[str, Any]:
+async def sync_directory(local_dir: Optional[str] = None, remote_dir: Optional[str] = None, 
+                         skip_unchanged: bool = True, check_hash: bool = False,
+                         concurrency: int = SYNC_WORKERS) -> Dict[str, Any]:
     """
-    Upload a single file to the remote SFTP server.
+    Synchronize a local directory to remote SFTP server.
     
     Args:
-        local_file_path: Path to the local file to upload
-        remote_file_path: Remote destination path (optional, will use same relative path)
+        local_dir: Local directory path (defaults to LOCAL_PATH env var)
+        remote_dir: Remote directory path (defaults to REMOTE_PATH env var)
+        skip_unchanged: Skip files that haven't changed (default: True)
+        check_hash: Use file hash for change detection (default: False)
+        concurrency: Number of parallel upload connections (default and maximum: SYNC_WORKERS env var);
+            1 uploads sequentially over a single connection
     
     Returns:
-        Dictionary with upload result
+        Dictionary with sync results including uploaded files and any errors
     """
-    if not os.path.exists(local_file_path):
+    return await asyncio.to_thread(_sync_directory, local_dir, remote_dir, skip_unchanged, check_hash,
+                                   concurrency)
+
+
+def _upload_file(local_file_path: str, remote_file_path: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking implementation of the upload_file tool."""
+    try:
+        local_stat = os.stat(local_file_path)
+    except (OSError, ValueError):
         return {"error": f"Local file does not exist: {local_file_path}"}
     
-    if not os.path.isfile(local_file_path):
+    if not stat.S_ISREG(local_stat.st_mode):
         return {"error": f"Path is not a file: {local_file_path}"}
     
     # Determine remote path
     if remote_file_path is None:
         if LOCAL_PATH and REMOTE_PATH:
-            if local_file_path.startswith(LOCAL_PATH):
-                relative_path = os.path.relpath(local_file_path, LOCAL_PATH)
-                remote_file_path = os.path.join(REMOTE_PATH, relative_path).replace('\\', '/')
+            normalized_path = os.path.abspath(local_file_path)
+            if os.path.normcase(normalized_path).startswith(_LOCAL_PATH_PREFIX):
+                relative_path = normalized_path[len(_LOCAL_PATH_PREFIX):]
+                remote_file_path = REMOTE_PATH.rstrip('/') + '/' + relative_path.replace(os.sep, '/')
             else:
                 return {"error": "Cannot determine remote path. Please specify remote_file_path."}
         else:
             return {"error": "Remote path not specified and no default paths configured."}
     
     try:
-        ssh_client = get_ssh_client()
-        sftp = ssh_client.open_sftp()
-        
-        # Ensure remote directory exists
-        remote_dir = os.path.dirname(remote_file_path)
-        if remote_dir:
-            current_path = ""
-            for part in remote_dir.split('/'):
-                if not part:
-                    continue
-                current_path += '/' + part
-                try:
-                    sftp.stat(current_path)
-                except FileNotFoundError:
-                    sftp.mkdir(current_path)
-        
-        # Upload the file
-        sftp.put(local_file_path, remote_file_path)
-        
-        # Get file info
-        local_size = os.path.getsize(local_file_path)
-        remote_stat = sftp.stat(remote_file_path)
-        
-        sftp.close()
-        ssh_client.close()
+        with borrow_ssh() as (ssh_client, sftp):
+            # Ensure remote directory exists (remote paths are always POSIX, whatever the local OS)
+            remote_dir = remote_file_path.rpartition('/')[0]
+            if remote_dir:
+                make_remote_dirs(sftp, remote_dir)
+            
+            # Upload the file; the confirming stat also provides the uploaded size
+            remote_stat = put_file(sftp, local_file_path, remote_file_path)
         
         return {
             "success": True,
             "local_file": local_file_path,
             "remote_file": remote_file_path,
-            "file_size": local_size,
+            "file_size": local_stat.st_size,
             "uploaded_size": remote_stat.st_size
         }
         
@@ -402,35 +1132,43 @@ def upload_file(local_file_path: str, remote_file_path: Optional[str] = None) ->
 
 
 @mcp.tool()
-def read_remote_file(remote_file_path: str, encoding: str = "utf-8") -> Dict[str, Any]:
+async def upload_file(local_file_path: str, remote_file_path: Optional[str] = None) -> Dict[str, Any]:
     """
-    Read the contents of a file from the remote SFTP server.
+    Upload a single file to the remote SFTP server.
     
     Args:
-        remote_file_path: Path to the remote file to read
-        encoding: Text encoding to use (default: utf-8)
+        local_file_path: Path to the local file to upload
+        remote_file_path: Remote destination path (optional, will use same relative path)
     
     Returns:
-        Dictionary with file contents or error
+        Dictionary with upload result
     """
+    return await asyncio.to_thread(_upload_file, local_file_path, remote_file_path)
+
+
+def _read_remote_file(remote_file_path: str, encoding: str = "utf-8") -> Dict[str, Any]:
+    """Blocking implementation of the read_remote_file tool."""
     try:
-        ssh_client = get_ssh_client()
-        sftp = ssh_client.open_sftp()
-        
-        with sftp.open(remote_file_path, 'r') as f:
-            content = f.read().decode(encoding)
-        
-        # Get file stats
-        stat = sftp.stat(remote_file_path)
-        
-        sftp.close()
-        ssh_client.close()
+        with borrow_ssh() as (ssh_client, sftp):
+            with sftp.open(remote_file_path, 'rb') as f:
+                file_stat = f.stat()
+                # Pipeline READ requests for the whole file instead of one round-trip per chunk
+                if file_stat.st_size:
+                    f.prefetch(file_stat.st_size)
+                
+                # Decode as chunks arrive so the raw bytes are never held in full
+                decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+                chunks = []
+                while chunk := f.read(READ_CHUNK_SIZE):
+                    chunks.append(decoder.decode(chunk))
+                chunks.append(decoder.decode(b'', final=True))
+                content = ''.join(chunks)
         
         return {
             "success": True,
             "file_path": remote_file_path,
             "content": content,
-            "file_size": stat.st_size,
+            "file_size": file_stat.st_size,
             "encoding": encoding
         }
         
@@ -443,33 +1181,33 @@ def read_remote_file(remote_file_path: str, encoding: str = "utf-8") -> Dict[str
 
 
 @mcp.tool()
-def execute_remote_command(command: str, working_directory: Optional[str] = None) -> Dict[str, Any]:
+async def read_remote_file(remote_file_path: str, encoding: str = "utf-8") -> Dict[str, Any]:
     """
-    Execute a command on the remote server via SSH.
+    Read the contents of a file from the remote SFTP server.
     
     Args:
-        command: Command to execute on the remote server
-        working_directory: Optional working directory for the command
+        remote_file_path: Path to the remote file to read
+        encoding: Text encoding to use (default: utf-8)
     
     Returns:
-        Dictionary with command output, exit code, and any errors
+        Dictionary with file contents or error
     """
+    return await asyncio.to_thread(_read_remote_file, remote_file_path, encoding)
+
+
+def _execute_remote_command(command: str, working_directory: Optional[str] = None) -> Dict[str, Any]:
+    """Blocking implementation of the execute_remote_command tool."""
     try:
-        ssh_client = get_ssh_client()
-        
         # Prepare command with working directory if specified
         if working_directory:
-            command = f"cd {working_directory} && {command}"
+            command = f"cd -- {shlex.quote(working_directory)} && {command}"
         
-        # Execute command
-        stdin, stdout, stderr = ssh_client.exec_command(command)
-        
-        # Get results
-        exit_code = stdout.channel.recv_exit_status()
-        stdout_content = stdout.read().decode('utf-8')
-        stderr_content = stderr.read().decode('utf-8')
-        
-        ssh_client.close()
+        with borrow_ssh() as (ssh_client, sftp):
+            # Execute command
+            exit_code, stdout_data, stderr_data = run_remote_command(ssh_client, command)
+            
+            stdout_content = stdout_data.decode('utf-8')
+            stderr_content = stderr_data.decode('utf-8')
         
         return {
             "success": True,
@@ -485,32 +1223,34 @@ def execute_remote_command(command: str, working_directory: Optional[str] = None
 
 
 @mcp.tool()
-def list_remote_directory(remote_dir_path: str) -> Dict[str, Any]:
+async def execute_remote_command(command: str, working_directory: Optional[str] = None) -> Dict[str, Any]:
     """
-    List contents of a remote directory.
+    Execute a command on the remote server via SSH.
     
     Args:
-        remote_dir_path: Path to the remote directory to list
+        command: Command to execute on the remote server
+        working_directory: Optional working directory for the command
     
     Returns:
-        Dictionary with directory contents
+        Dictionary with command output, exit code, and any errors
     """
+    return await asyncio.to_thread(_execute_remote_command, command, working_directory)
+
+
+def _list_remote_directory(remote_dir_path: str) -> Dict[str, Any]:
+    """Blocking implementation of the list_remote_directory tool."""
     try:
-        ssh_client = get_ssh_client()
-        sftp = ssh_client.open_sftp()
-        
-        items = []
-        for item in sftp.listdir_attr(remote_dir_path):
-            items.append({
-                "name": item.filename,
-                "size": item.st_size,
-                "is_directory": item.st_mode and (item.st_mode & 0o040000) != 0,
-                "permissions": oct(item.st_mode)[-3:] if item.st_mode else None,
-                "modified_time": item.st_mtime
-            })
-        
-        sftp.close()
-        ssh_client.close()
+        with borrow_ssh() as (ssh_client, sftp):
+            items = [
+                {
+                    "name": item.filename,
+                    "size": item.st_size,
+                    "is_directory": stat.S_ISDIR(item.st_mode or 0),
+                    "permissions": f"{item.st_mode & 0o777:03o}" if item.st_mode else None,
+                    "modified_time": item.st_mtime
+                }
+                for item in sftp.listdir_attr(remote_dir_path)
+            ]
         
         return {
             "success": True,
@@ -525,21 +1265,40 @@ def list_remote_directory(remote_dir_path: str) -> Dict[str, Any]:
         return {"error": f"Failed to list directory: {str(e)}"}
 
 
+@mcp.tool()
+async def list_remote_directory(remote_dir_path: str) -> Dict[str, Any]:
+    """
+    List contents of a remote directory.
+    
+    Args:
+        remote_dir_path: Path to the remote directory to list
+    
+    Returns:
+        Dictionary with directory contents
+    """
+    return await asyncio.to_thread(_list_remote_directory, remote_dir_path)
+
+
+# Configuration is fixed for the process lifetime, so serialize it only once
+_CONFIG_JSON = json.dumps({
+    "host": TARGET_HOST,
+    "port": TARGET_PORT,
+    "username": TARGET_USERNAME,
+    "local_path": LOCAL_PATH,
+    "remote_path": REMOTE_PATH,
+    "ignore_patterns": IGNORE_PATTERNS,
+    "ignore_engine": type(_ENV_IGNORE_MATCHER).__name__,
+    "compression": SFTP_COMPRESS,
+    "connection_status": "configured" if _CONFIG_OK else "incomplete"
+}, indent=2)
+
+
 @mcp.resource("sftp://config")
 def get_sftp_config() -> str:
     """
     Get current SFTP server configuration (without sensitive data).
     """
-    config = {
-        "host": TARGET_HOST,
-        "port": TARGET_PORT,
-        "username": TARGET_USERNAME,
-        "local_path": LOCAL_PATH,
-        "remote_path": REMOTE_PATH,
-        "ignore_patterns": IGNORE_PATTERNS,
-        "connection_status": "configured" if all([TARGET_HOST, TARGET_USERNAME, TARGET_PASSWORD]) else "incomplete"
-    }
-    return json.dumps(config, indent=2)
+    return _CONFIG_JSON
 
 
 @mcp.prompt()
@@ -581,6 +1340,11 @@ Example: upload_file("/path/to/local/file.txt", "/remote/path/file.txt")
 
 def main():
     """Main entry point for the MCP server."""
+    if not _CONFIG_OK:
+        # stdout carries the JSON-RPC stream, so report configuration problems on stderr
+        print(f"[SFTP-MCP] Missing required environment variables: {', '.join(_MISSING_CONFIG)}",
+              file=sys.stderr)
+    
     # Run the MCP server using stdio transport
     mcp.run()
 